@@ -13,7 +13,6 @@ DEFAULT_CONFIG_PATH = PROJECT_ROOT / DEFAULT_CONFIG_FILE
 
 REQUIRED_PATH_KEYS = [
     "temp_folder",
-    "temp_folder_crop",
     "temp_folder_trans",
     "temp_folder_rec",
     "temp_folder_img_v1",
@@ -41,7 +40,6 @@ REQUIRED_FILE_KEYS = [
 @dataclass
 class FolderPaths:
     temp: Path
-    temp_crop: Path
     temp_trans: Path
     temp_rec: Path
     temp_img_v1: Path
@@ -139,7 +137,6 @@ def _build_app_config(cfg: dict) -> AppConfig:
     return AppConfig(
         folders=FolderPaths(
             temp=PROJECT_ROOT / Path(folders_cfg["temp_folder"]),
-            temp_crop=PROJECT_ROOT / Path(folders_cfg["temp_folder_crop"]),
             temp_trans=PROJECT_ROOT / Path(folders_cfg["temp_folder_trans"]),
             temp_rec=PROJECT_ROOT / Path(folders_cfg["temp_folder_rec"]),
             temp_img_v1=PROJECT_ROOT / Path(folders_cfg["temp_folder_img_v1"]),
@@ -563,7 +563,7 @@ PALETTES_V1 = {
             (np.int64(128), np.int64(0), np.int64(0)), # 100 +
         ],
         "boundaries": [-float("inf"), 0, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63, 64, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 76, 78, 81, 84, 87, 90, 93, 96, 100],  # Temperature ranges in °C
-        "classes": [-999, -1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60], # Sequential class indices produced by reclassify_raster (np.digitize), used as BoundaryNorm bins
+        "classes": [-999, -1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60], # Sequential class indices produced by classify_values (np.digitize semantics), used as BoundaryNorm bins
     },
     "UTCI": {
         "colors": [
@@ -993,3 +993,9 @@ PARAMETERS = [
 CRS_FOR_DATA = CRS.from_epsg(3857)
 
 DPI = 150
+
+# Size (width, height) of a single map inside the composite layouts
+LAYOUT_MAP_SIZE = (850, 906)
+
+# Subfolder next to the rendered maps that holds their copies at layout size
+LAYOUT_MAP_DIR = "layout"
@@ -1,11 +1,23 @@
 import logging
 import time
 from collections.abc import Callable
+from multiprocessing import cpu_count
 from typing import TypeVar
 
 T = TypeVar("T")
 
 
+def default_max_workers(limit: int = 8) -> int:
+    """Return the pool size: all cores but one, capped at the given limit."""
+    cores = cpu_count()
+    return min(cores - 1 if cores > 1 else 1, limit)
+
+
+def threads_per_worker(max_workers: int) -> int:
+    """Return the threads each pool process may use without oversubscribing."""
+    return max(1, cpu_count() // max_workers)
+
+
 def run_step(
         step_name: str,
         action: Callable[[], T],
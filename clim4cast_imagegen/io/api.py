@@ -10,6 +10,9 @@ import aiohttp
 from clim4cast_imagegen.core.config import AppConfig
 from clim4cast_imagegen.core.exceptions import UploadIncompleteError
 
+# Only the generated images are delivered to the API
+UPLOAD_PATTERN = "*.png"
+
 
 @dataclass(frozen=True)
 class UploadReport:
@@ -59,14 +62,16 @@ async def upload_files_to_api(
         logger.error(f" Root folder does not exist: {root_folder}")
         return UploadReport(uploaded=[], failed=[])
 
-    all_files = list(root_folder.rglob("*.*"))
+    all_files = list(root_folder.rglob(UPLOAD_PATTERN))
 
     auth = aiohttp.BasicAuth(username, password)
 
     connector = aiohttp.TCPConnector(
         limit=max_concurrent,
         limit_per_host=max_concurrent,
-        ssl=False
+        ssl=False,
+        keepalive_timeout=60,
+        ttl_dns_cache=300,
     )
 
     timeout = aiohttp.ClientTimeout(total=300)
@@ -130,22 +135,29 @@ async def upload_single_file(
                 await asyncio.sleep(base_delay * 2 ** (attempt - 1))
 
             try:
-                async with session.post(url, data=file_path.read_bytes()) as response:
-                    if response.status == 200:
-                        logger.info(f"OK status_code 200 {url}")
-                        return True
-                    elif 400 <= response.status < 500:
-                        text = await response.text()
-                        logger.error(
-                            f"{file_path} -> {response.status}: {text} "
-                            )
-                        return False
-                    elif response.status >= 500:
-                        text = await response.text()
-                        logger.warning(
-                            f"{file_path} -> {response.status}: {text}, "
-                            f"{attempt}/{max_attempts}"
-                            )
+                # Stream the file from disk instead of reading it into memory;
+                # it is reopened for every attempt
+                with file_path.open("rb") as file_obj:
+                    async with session.post(
+                        url,
+                        data=file_obj,
+                        headers={"Content-Type": "application/octet-stream"},
+                        ) as response:
+                        if response.status == 200:
+                            logger.debug(f"OK status_code 200 {url}")
+                            return True
+                        elif 400 <= response.status < 500:
+                            text = await response.text()
+                            logger.error(
+                                f"{file_path} -> {response.status}: {text} "
+                                )
+                            return False
+                        elif response.status >= 500:
+                            text = await response.text()
+                            logger.warning(
+                                f"{file_path} -> {response.status}: {text}, "
+                                f"{attempt}/{max_attempts}"
+                                )
 
             except (asyncio.TimeoutError, aiohttp.ClientError) as err:
                 logger.warning(f"{file_path} {err}, {attempt}/{max_attempts}")
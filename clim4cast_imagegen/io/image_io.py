@@ -4,8 +4,12 @@ from PIL import Image
 
 
 def open_rgba(path: Path) -> Image.Image:
-    """Open an image file and convert it to RGBA mode."""
-    return Image.open(path).convert("RGBA")
+    """Open an image file and convert it to RGBA mode if it is not already."""
+    with Image.open(path) as img:
+        img.load()
+        if img.mode == "RGBA":
+            return img
+        return img.convert("RGBA")
 
 
 def save_image(image: Image.Image, dst_path: Path, **kwargs) -> None:
@@ -13,19 +17,15 @@ def save_image(image: Image.Image, dst_path: Path, **kwargs) -> None:
     image.save(dst_path, **kwargs)
 
 
-def trim_image_sides(
-        image_path: Path,
+def crop_sides(
+        image: Image.Image,
         left: int = 0,
         right: int = 0,
         top: int = 0,
         bottom: int = 0,
-    ) -> None:
+    ) -> Image.Image:
     """
-    Crop a fixed number of pixels from each side of an image, in place.
+    Return a copy of an image with a fixed number of pixels cut from each side.
     """
-    with Image.open(image_path) as img:
-        img.load()
-        width, height = img.size
-        cropped = img.crop((left, top, width - right, height - bottom))
-
-    cropped.save(image_path)
+    width, height = image.size
+    return image.crop((left, top, width - right, height - bottom))
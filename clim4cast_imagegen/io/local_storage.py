@@ -62,14 +62,26 @@ def iter_matching_files (
     """
     Yield files under the root that match the given extensions and name parts.
     """
-    ext_set = {e.lower() for e in extensions}
-
-    # Loop through all elements in the directory and its subdirectories
-    for element in directory_path.rglob("*"):
-        # Skip files that don't match the desired extensions
-        if element.suffix.lower() in ext_set:
-            if any(param in element.stem for param in parameters):
-                yield element
+    ext_tuple = tuple(e.lower() for e in extensions)
+    param_tuple = tuple(parameters)
+
+    # Walk the tree with an explicit stack of directories; scandir entries
+    # carry the file type, so no extra stat call is needed per element
+    stack = [os.fspath(directory_path)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+
+                # Skip files that don't match the desired extensions
+                if not entry.name.lower().endswith(ext_tuple):
+                    continue
+
+                stem = os.path.splitext(entry.name)[0]
+                if any(param in stem for param in param_tuple):
+                    yield Path(entry.path)
 
 
 def find_input_data(
@@ -1,13 +1,43 @@
 import logging
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import rasterio
 from pyproj import CRS
-from rasterio.features import shapes
+from rasterio.crs import CRS as RioCRS
 from rasterio.mask import mask
+from rasterio.transform import array_bounds
 from rasterio.warp import Resampling, calculate_default_transform, reproject
+from shapely.geometry import box, mapping
+
+# NoData value used for class rasters when the source does not define one
+DEFAULT_NODATA = -999.0
+
+# Working memory for the GDAL warper, in MB
+WARP_MEM_LIMIT = 512
+
+# GDAL configuration for every raster open in this module. It is applied per
+# call because an Env opened in the parent does not reach pool workers.
+# EMPTY_DIR stops GDAL from listing the whole directory on each open; the
+# decoding thread count is set per call from num_threads
+GDAL_ENV_OPTIONS: dict[str, Any] = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+}
+
+# Creation options for intermediate GeoTIFFs: tiled, deflate-compressed blocks
+# keep files small and make windowed reads cheap; the compression thread
+# count is set per call from num_threads
+GTIFF_CREATION_OPTIONS: dict[str, Any] = {
+    "tiled": True,
+    "blockxsize": 512,
+    "blockysize": 512,
+    "compress": "deflate",
+    "predictor": 2,
+    "BIGTIFF": "IF_SAFER",
+}
 
 
 def load_mask_shapes(
@@ -21,128 +51,190 @@ def load_mask_shapes(
         raise FileNotFoundError(f"Missing mask file: {frame_to_raster}")
 
     with rasterio.open(frame_to_raster) as src:
-        # Read the first band (channel) of the raster file into a numpy array
-        src_data = src.read(1)
-        src_transform = (
-            src.transform
-        )
-
-        # Create mask shapes from the raster data using the 'shapes' function
-        # This converts raster values into geometries (polygons) based on raster
-        mask_shapes = [
-            geom
-            for geom, value in shapes(
-                src_data, mask=None, transform=src_transform
-            )
-        ]
+        # Polygonizing the extent raster without a mask covers every pixel, so
+        # the shapes always add up to the raster footprint. A single box over
+        # the raster bounds clips the same area without building thousands
+        # of polygons for rasterio.mask to rasterize again
+        mask_shapes = [mapping(box(*src.bounds))]
 
     return mask_shapes
 
 
-def read_and_clip_raster(
+def clip_and_reproject_raster(
         path_to_raster: Path,
         mask_shapes: list[Any],
+        target_crs: CRS,
         output_path: Path,
+        num_threads: int | None = None,
+        warp_mem_limit: int = WARP_MEM_LIMIT,
         ) -> None:
     """
-    Clip a raster with the given shapes and save it.
+    Clip a raster with the given shapes, reproject it to the given CRS and
+    save it. The clipped data stays in memory, so only the result is written.
+    Decoding, the warp and encoding use num_threads threads (all cores by
+    default) and the warp gets warp_mem_limit MB of working memory.
     """
-    # Read the large raster file
-    with rasterio.open(path_to_raster) as src:
-        # Clip the raster using the provided mask shapes (crop=True ensures that
-        # the raster is cropped to the mask area)
-        src_data, src_transform = mask(src, mask_shapes, crop=True)
-
-        # Create new metadata for the output raster to ensure the correct
-        # geospatial referencing
-        output_meta = src.meta.copy()
-        output_meta.update(
-            {
-                "driver": "GTiff",
-                "count": src.count,
-                "dtype": src.dtypes[0],
-                "width": src_data.shape[2],
-                "height": src_data.shape[1],
-                "transform": src_transform,
-                "compress": "lzw"
-            }
-        )
-
-        # Write the clipped raster data to the output file
-        with rasterio.open(output_path, "w", **output_meta) as dst:
-            dst.write(src_data)
-
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+
+    with rasterio.Env(GDAL_NUM_THREADS=num_threads, **GDAL_ENV_OPTIONS):
+        # Read the large raster file
+        with rasterio.open(path_to_raster) as src:
+            # Clip the raster using the provided mask shapes (crop=True ensures
+            # that the raster is cropped to the mask area)
+            src_data, src_transform = mask(
+                src, mask_shapes, crop=True, indexes=1
+                )
+            src_crs = src.crs
+            nodata_value = src.nodata
+            dtype = src.dtypes[0]
 
+        height, width = src_data.shape
+        dst_data, dst_transform = src_data, src_transform
 
-def convert_coordinate_system_in_raster(
-                                        target_crs: CRS,
-                                        input_path: Path,
-                                        output_path: Path
-                                        ) -> None:
-    """Reproject a raster to the given CRS and save it."""
-    # Open the source raster to check its CRS and other properties
-    with rasterio.open(input_path) as src:
+        # Convert the CRS to WKT once; the cached helpers, the warp and the
+        # writer all take the string, so the target CRS is not re-exported
+        src_crs_wkt, target_crs_wkt = src_crs.to_wkt(), target_crs.to_wkt()
 
         # Check if the CRS of the raster is different from the target CRS
-        if src.crs != target_crs:
-            # Calculate the transformation needed to convert the current CRS
+        if not _same_crs(src_crs_wkt, target_crs_wkt):
+            # Calculate the transformation needed to convert the clipped raster
             # to target CRS
-            transform, width, height = calculate_default_transform(
-                src.crs, target_crs, src.width, src.height, *src.bounds
+            dst_transform, width, height = _default_transform(
+                src_crs_wkt, target_crs_wkt, width, height,
+                array_bounds(height, width, src_transform)
+            )
+            fill_value = nodata_value if nodata_value is not None else 0
+            dst_data = np.full((height, width), fill_value, dtype=dtype)
+
+            # Reproject the data from the source CRS to the target CRS
+            reproject(
+                source=src_data,
+                destination=dst_data,
+                src_transform=src_transform,
+                src_crs=src_crs,
+                src_nodata=nodata_value,
+                dst_transform=dst_transform,
+                dst_crs=target_crs_wkt,
+                dst_nodata=nodata_value,
+                resampling=Resampling.nearest,
+                num_threads=num_threads,
+                warp_mem_limit=warp_mem_limit,
             )
-            nodata_value = src.nodata
 
-            # Open a new raster file for saving the reprojected data
-            with rasterio.open(output_path, "w", driver="GTiff",
-                            count=1, dtype=src.dtypes[0],
-                            crs=target_crs, transform=transform,
-                            width=width, height=height,
-                            nodata=nodata_value) as dst:
-
-                # Reproject the data from the source CRS to the target CRS
-                reproject(
-                    source=rasterio.band(src, 1),
-                    destination=rasterio.band(dst, 1),
-                    src_transform=src.transform,
-                    src_crs=src.crs,
-                    dst_transform=transform,
-                    dst_crs=target_crs,
-                    resampling=Resampling.nearest
-                )
+        # Write the clipped and reprojected raster to the output file
+        with rasterio.open(output_path, "w", driver="GTiff",
+                           count=1, dtype=dtype,
+                           crs=target_crs_wkt, transform=dst_transform,
+                           width=width, height=height,
+                           nodata=nodata_value,
+                           NUM_THREADS=num_threads,
+                           **GTIFF_CREATION_OPTIONS) as dst:
+            dst.write(dst_data, 1)
 
 
-def reclassify_raster(
-                    raster_path: Path,
-                    output_raster_path: Path,
-                    boundaries: list[float]
-                    ) -> Path:
-    """Convert raster values into class indices and save them as int16."""
-    with rasterio.open(raster_path) as src:
-        raster_data = src.read(1)
-        profile = src.profile
-        # Default to -999 if NoData is not defined
-        nodata_value = src.nodata if src.nodata is not None else -999.0
+@lru_cache(maxsize=32)
+def _same_crs(src_crs_wkt: str, target_crs_wkt: str) -> bool:
+    """
+    Compare two CRS given as WKT, once per pair.
+    """
+    return RioCRS.from_wkt(src_crs_wkt) == RioCRS.from_wkt(target_crs_wkt)
 
-    # Reclassify the raster data based on the provided boundaries
-    classes = np.digitize(raster_data, bins=boundaries, right=True) - 1
 
-    final_path = Path(output_raster_path) / Path(raster_path).name
+@lru_cache(maxsize=256)
+def _default_transform(
+        src_crs_wkt: str,
+        target_crs_wkt: str,
+        width: int,
+        height: int,
+        bounds: tuple[float, float, float, float],
+        ) -> tuple[rasterio.Affine, int, int]:
+    """
+    Calculate the output grid of a reprojection, once per input grid.
+    """
+    return calculate_default_transform(
+        src_crs_wkt, target_crs_wkt, width, height, *bounds
+        )
 
-    # Update the profile with new data type and NoData value
-    profile.update(dtype=rasterio.int16, count=1, nodata=nodata_value)
 
-    # Write the reclassified raster to the output path
-    with rasterio.open(final_path, 'w', **profile) as dst:
-        dst.write(classes.astype(rasterio.int16), 1)
+def classify_values(
+        raster_data: np.ndarray,
+        boundaries: list[float],
+        nodata_value: float | None = None,
+        ) -> np.ndarray:
+    """Convert raster values into int16 class indices, keeping NoData."""
+    # Default to -999 if NoData is not defined
+    if nodata_value is None:
+        nodata_value = DEFAULT_NODATA
 
-    return final_path
+    bins = np.asarray(boundaries, dtype=np.float64)
+
+    if np.issubdtype(raster_data.dtype, np.floating):
+        bins = _bins_for_dtype(bins, raster_data.dtype)
+
+    # NoData pixels stay NoData; only the valid pixels are searched
+    classes = np.full(
+        raster_data.shape, _class_nodata(nodata_value), dtype=np.int16
+        )
+    valid = raster_data != nodata_value
+    if np.issubdtype(raster_data.dtype, np.floating):
+        # NaN never compares equal, so NaN NoData has to be dropped explicitly
+        valid &= ~np.isnan(raster_data)
+
+    # Reclassify the raster data based on the provided boundaries; for sorted
+    # boundaries searchsorted(side="left") matches digitize(right=True).
+    # searchsorted always returns int64, so shift that index in place instead
+    # of allocating a second int64 array for "- 1"
+    class_index = np.searchsorted(bins, raster_data[valid], side="left")
+    class_index -= 1
+    classes[valid] = class_index
+
+    return classes
+
+
+def _class_nodata(nodata_value: float) -> int:
+    """
+    Return the NoData of the int16 classes: the source NoData if it is a
+    whole number in int16 range, otherwise DEFAULT_NODATA (e.g. for NaN or
+    the float32 minimum).
+    """
+    int16_info = np.iinfo(np.int16)
+    if (
+        np.isfinite(nodata_value)
+        and float(nodata_value).is_integer()
+        and int16_info.min <= nodata_value <= int16_info.max
+    ):
+        return int(nodata_value)
+    return int(DEFAULT_NODATA)
+
+
+def _bins_for_dtype(bins: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """
+    Cast class boundaries to the raster dtype, so searchsorted does not copy
+    the raster to float64. Boundaries that are not exact in that dtype are
+    rounded down, which keeps value <= boundary true for the same values.
+    """
+    cast_bins = bins.astype(dtype)
+    too_high = cast_bins > bins
+    cast_bins[too_high] = np.nextafter(
+        cast_bins[too_high], np.array(-np.inf, dtype=dtype)
+        )
+    return cast_bins
 
 
 def read_raster_for_visualization(
-        raster_path: Path
+        raster_path: Path,
+        num_threads: int | None = None,
         ) -> tuple[np.ndarray, rasterio.Affine, float|None, int, int]:
     """
-    Read raster data and metadata required for visualization.
+    Read raster data and metadata required for visualization, decoding with
+    num_threads threads (all cores by default).
     """
-    with rasterio.open(raster_path) as src:
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+
+    with (
+        rasterio.Env(GDAL_NUM_THREADS=num_threads, **GDAL_ENV_OPTIONS),
+        rasterio.open(raster_path) as src,
+    ):
         return src.read(1), src.transform, src.nodata, src.width, src.height
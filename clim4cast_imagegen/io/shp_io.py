@@ -1,5 +1,6 @@
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import geopandas as gpd
@@ -43,13 +44,25 @@ def load_shp(
         raise FileNotFoundError(f"Could not find shapefile at {path}")
 
     try:
-        shp_file = gpd.read_file(path)
+        shp_file = _read_shp(path, target_crs.to_wkt())
+        logger.debug(f"Loaded {path.name} in EPSG:{target_crs.to_epsg()}")
 
-        if shp_file.crs is None or not shp_file.crs.equals(target_crs):
-            logger.debug(f"Reprojecting {path.name} to {target_crs.to_epsg()}")
-            shp_file = shp_file.to_crs(target_crs)
-
-        return shp_file
+        # Hand out a copy so callers cannot modify the cached frame
+        return shp_file.copy()
     except Exception as err:
         logger.exception(f"Failed to load shapefile {path.name}: {err}")
         raise
+
+
+@lru_cache(maxsize=32)
+def _read_shp(path: Path, target_crs_wkt: str) -> gpd.GeoDataFrame:
+    """
+    Read a shapefile and reproject it, once per path and target CRS.
+    """
+    target_crs = CRS.from_wkt(target_crs_wkt)
+    shp_file = gpd.read_file(path, engine="pyogrio")
+
+    if shp_file.crs is None or not shp_file.crs.equals(target_crs):
+        shp_file = shp_file.to_crs(target_crs)
+
+    return shp_file
@@ -1,10 +1,16 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from clim4cast_imagegen.core.constants import LAYOUT_MAP_SIZE
 from clim4cast_imagegen.io.image_io import open_rgba, save_image
 
+# Upper limit of threads decoding the maps of one layout
+MAX_DECODE_THREADS = 8
+
 
 def combine_maps_with_layout(
                             background_path: Path,
@@ -22,18 +28,23 @@ def combine_maps_with_layout(
     # Specify positioning and dimensions for maps and labels
     start_x = 24
     start_y = 94
-    map_width = 850
-    map_height = 906
+    map_width, map_height = LAYOUT_MAP_SIZE
     step_x = map_width + 18  # Horizontal step between maps
     step_y = map_height + 122  # Vertical step
 
     # Create a drawing object for adding labels
     draw = ImageDraw.Draw(background)
-    font = ImageFont.truetype(str(font_path), size=62)
+    font = _get_font(str(font_path), 62)
+
+    # Decode the maps in threads; PNG decoding releases the GIL
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_DECODE_THREADS, len(maps_list)))
+            ) as pool:
+        map_images = list(pool.map(_load_layout_map, maps_list))
 
     # Iterate through maps and place them on the background
-    for idx, (map_path, label) in enumerate(
-                            zip(maps_list, labels_list, strict=True)
+    for idx, (map_rgba, label) in enumerate(
+                            zip(map_images, labels_list, strict=True)
                             ):
         # Calculate position
         row = idx // 5  # Create a new row every 5 maps
@@ -42,12 +53,8 @@ def combine_maps_with_layout(
         x = start_x + col * step_x
         y = start_y + row * step_y
 
-        # Open map image
-        with Image.open(map_path) as map_image:
-            map_rgba = map_image.convert("RGBA").resize((map_width, map_height))
-
-            # Paste the map on the background
-            background.paste(map_rgba, (x, y), map_rgba)
+        # Composite the map over the background in place
+        background.alpha_composite(map_rgba, dest=(x, y))
 
         # Add label below the map
         label_x = x + 42
@@ -59,12 +66,33 @@ def combine_maps_with_layout(
             background,
             output_path,
             format="PNG",
-            optimize=True,
+            compress_level=3,
             dpi=(300, 300)
             )
     logger.debug(f"Layout saved to {output_path}")
 
 
+def _load_layout_map(map_path: Path) -> Image.Image:
+    """
+    Open a map image as RGBA at the size used in the layouts.
+    """
+    map_rgba = open_rgba(map_path)
+
+    # Maps are normally rendered at layout size already
+    if map_rgba.size != LAYOUT_MAP_SIZE:
+        map_rgba = map_rgba.resize(LAYOUT_MAP_SIZE)
+
+    return map_rgba
+
+
+@lru_cache(maxsize=8)
+def _get_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a TrueType font once per path and size.
+    """
+    return ImageFont.truetype(font_path, size=size)
+
+
 def convert_to_rgb_png(src_path: Path, dst_path: Path, logger) -> None:
     """
     Open an image, convert it to RGB, and save it as PNG.
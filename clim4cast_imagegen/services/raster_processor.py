@@ -1,4 +1,6 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -6,11 +8,11 @@ from tqdm import tqdm
 
 from clim4cast_imagegen.core.config import AppConfig
 from clim4cast_imagegen.core.constants import CRS_FOR_DATA
+from clim4cast_imagegen.core.pipeline import default_max_workers, threads_per_worker
 from clim4cast_imagegen.io.local_storage import ensure_dir, iter_matching_files
 from clim4cast_imagegen.io.raster_io import (
-    convert_coordinate_system_in_raster,
+    clip_and_reproject_raster,
     load_mask_shapes,
-    read_and_clip_raster,
 )
 from clim4cast_imagegen.services.layout_engine import convert_to_rgb_png
 from clim4cast_imagegen.utils.pathname_utils import build_new_filename, extract_date
@@ -36,11 +38,10 @@ def generate_base_raster(
     images = process_rasters(
         rasters,
         mask_shape,
-        config.folders.temp_crop,
         config.folders.temp_trans,
         )
     logger.info(f"All base rasters were clipped, converted, and saved "
-                f"to {config.folders.temp_crop}")
+                f"to {config.folders.temp_trans}")
 
     return images
 
@@ -48,30 +49,51 @@ def generate_base_raster(
 def process_rasters(
                     rasters: list[Path],
                     mask_shape: list[Any],
-                    temp_folder: Path,
                     temp_folder_img: Path,
                     ) -> list[Path]:
     """Clip rasters with the frame mask and reproject them to the target CRS."""
-    images = []
-    for raster in tqdm(rasters):
-        # Define output paths for clipped raster and coordinate system converted
-        # raster
-        output_path = temp_folder / raster.name
-        output_path_2 = temp_folder_img / raster.name
-        # Clip raster based on the mask shape and save the result
-        read_and_clip_raster(raster, mask_shape, output_path)
-        # Convert the coordinate system of the raster and save the result
-        convert_coordinate_system_in_raster(
-                                            CRS_FOR_DATA,
-                                            output_path,
-                                            output_path_2
-                                            )
-
-        images.append(output_path_2)
+    max_workers = default_max_workers()
+
+    # Split the cores between the workers, so the GDAL threads of all
+    # workers together do not oversubscribe the CPU
+    worker_func = partial(
+        process_single_source_raster,
+        mask_shape=mask_shape,
+        temp_folder_img=temp_folder_img,
+        num_threads=threads_per_worker(max_workers),
+    )
+
+    # Every raster is independent, so spread them over worker processes;
+    # map() keeps the output order identical to the input order
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        images = list(tqdm(
+                            executor.map(worker_func, rasters),
+                            total=len(rasters),
+                            ))
 
     return images
 
 
+def process_single_source_raster(
+        raster: Path,
+        mask_shape: list[Any],
+        temp_folder_img: Path,
+        num_threads: int | None = None,
+        ) -> Path:
+    """
+    Clip one raster, reproject it, and return the path of the result.
+    """
+    output_path = temp_folder_img / raster.name
+
+    # Clip the raster with the mask shape, convert its coordinate system and
+    # save the result in a single pass
+    clip_and_reproject_raster(
+        raster, mask_shape, CRS_FOR_DATA, output_path, num_threads=num_threads
+        )
+
+    return output_path
+
+
 def rename_and_copy_images(
         files_map: dict,
         dst_root: Path,
@@ -84,6 +106,8 @@ def rename_and_copy_images(
     dst_root = Path(dst_root)
     ensure_dir(dst_root)
 
+    src_paths: list[Path] = []
+    dst_paths: list[Path] = []
     for paths in files_map.values():
         path_objs = [Path(p) for p in paths]
         sorted_paths = sorted(
@@ -91,9 +115,13 @@ def rename_and_copy_images(
             key=extract_date
         )
 
-        # Copy with new names
+        # Pair every image with its new name
         for i, src_path in enumerate(sorted_paths):
             new_name = build_new_filename(src_path, i)
-            dst_path = dst_root / new_name
+            src_paths.append(src_path)
+            dst_paths.append(dst_root / new_name)
 
-            convert_to_rgb_png(src_path, dst_path, logger)
+    # Re-encoding the PNGs is CPU-bound, so spread it over worker processes
+    worker_func = partial(convert_to_rgb_png, logger=logger)
+    with ProcessPoolExecutor(max_workers=default_max_workers()) as executor:
+        list(executor.map(worker_func, src_paths, dst_paths, chunksize=8))
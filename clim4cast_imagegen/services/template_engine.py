@@ -1,17 +1,21 @@
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from datetime import datetime
-from multiprocessing import cpu_count
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 from clim4cast_imagegen.core.config import AppConfig
+from clim4cast_imagegen.core.pipeline import default_max_workers
 from clim4cast_imagegen.io.local_storage import (
     ensure_dir,
     find_png_files_grouped_by_dir,
 )
 from clim4cast_imagegen.services.layout_engine import combine_maps_with_layout
 from clim4cast_imagegen.utils.palette_utils import select_palette
-from clim4cast_imagegen.utils.pathname_utils import background_type_from_template
+from clim4cast_imagegen.utils.pathname_utils import (
+    background_type_from_template,
+    composite_name,
+    date_label,
+    layout_map_path,
+)
 
 
 def generate_templates(
@@ -26,19 +30,22 @@ def generate_templates(
     templates = find_png_files_grouped_by_dir(
         config.templates_path,
         )
-    max_workers = min(cpu_count() - 1 if cpu_count() > 1 else 1, 8)
+    max_workers = default_max_workers()
 
     logger.info(f"Template generation using {max_workers} workers")
 
-    for relative_dir, backgrounds in templates.items():
-        target_dir = config.folders.temp_downloads / relative_dir
+    # One pool for all template folders, so workers start only once
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures: list[Future[None]] = []
+
+        for relative_dir, backgrounds in templates.items():
+            target_dir = config.folders.temp_downloads / relative_dir
 
-        ensure_dir(target_dir)
+            ensure_dir(target_dir)
 
-        layout = select_palette(relative_dir, visualizations)
+            layout = select_palette(relative_dir, visualizations)
 
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
+            futures.extend(
                 executor.submit(
                     process_single_background,
                     background,
@@ -47,16 +54,16 @@ def generate_templates(
                     config.font_path,
                 )
                 for background in backgrounds
-            ]
+            )
 
-            for future in as_completed(futures):
-                try:
-                    future.result()
+        for future in as_completed(futures):
+            try:
+                future.result()
 
-                except Exception as exc:
-                    logger.exception(
-                        f"Template worker failed: {exc}"
-                    )
+            except Exception as exc:
+                logger.exception(
+                    f"Template worker failed: {exc}"
+                )
 
 
 def process_single_background(
@@ -80,29 +87,15 @@ def process_single_background(
             )
         return
 
-    date_labels = []
-
     # Extract date labels from image filenames
-    for img in img_list:
-        date = img.stem.split("_")[-1]
-
-        formatted_date = datetime.strptime(
-                                            date, "%Y-%m-%d"
-                                            ).strftime("%d.%m.%Y")
-
-        date_labels.append(formatted_date)
-
-    if "DFM" in background_type:
-        background_type = background_type.replace("DFM", "DFM_")
-    if "AW" in background_type:
-        background_type += "cm"
+    date_labels = [date_label(img) for img in img_list]
 
     # Define the output path for the composite image
-    out_comp_file = work_folder / f"{background_type}.png"
+    out_comp_file = work_folder / f"{composite_name(background_type)}.png"
 
     combine_maps_with_layout(
                             background,
-                            img_list,
+                            [layout_map_path(img) for img in img_list],
                             date_labels,
                             out_comp_file,
                             font_path,
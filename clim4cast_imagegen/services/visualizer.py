@@ -4,37 +4,70 @@ matplotlib.use("Agg")
 
 import logging
 from concurrent.futures import ProcessPoolExecutor
-from functools import partial
-from multiprocessing import cpu_count
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from io import BytesIO
 from pathlib import Path
 
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.axes import Axes
 from matplotlib.colors import (
     BoundaryNorm,
     ListedColormap,
 )
-from rasterio.plot import show
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from PIL import Image
+from rasterio import Affine
+from rasterio.plot import plotting_extent, show
+from shapely.geometry import box
 from tqdm import tqdm
 
 from clim4cast_imagegen.core.config import AppConfig
-from clim4cast_imagegen.core.constants import DPI
+from clim4cast_imagegen.core.constants import DPI, LAYOUT_MAP_SIZE
 from clim4cast_imagegen.core.palette_types import (
     PALETTE_REGISTRY_V1,
     PALETTE_REGISTRY_V2,
 )
-from clim4cast_imagegen.io.image_io import trim_image_sides
+from clim4cast_imagegen.core.pipeline import default_max_workers, threads_per_worker
+from clim4cast_imagegen.io.image_io import crop_sides, save_image
+from clim4cast_imagegen.io.local_storage import ensure_dir
 from clim4cast_imagegen.io.raster_io import (
+    classify_values,
     read_raster_for_visualization,
-    reclassify_raster,
 )
 from clim4cast_imagegen.io.shp_io import VisualLayers, load_visual_shapefiles
 from clim4cast_imagegen.services.raster_processor import (
     rename_and_copy_images,
 )
 from clim4cast_imagegen.utils.palette_utils import PaletteConfig
-from clim4cast_imagegen.utils.pathname_utils import background_type_from_raster
+from clim4cast_imagegen.utils.pathname_utils import (
+    background_type_from_raster,
+    layout_map_path,
+)
+
+
+@dataclass
+class MapFigure:
+    """Figure with the overlay layers already drawn, reused between rasters"""
+    shapefiles: VisualLayers
+    extent: tuple[float, float, float, float]
+    fig: Figure
+    ax: Axes
+    image: AxesImage
+
+
+# Share of the raster extent added on each side when selecting overlay shapes
+EXTENT_PAD = 0.05
+
+# Figure of the current process, built on the first map and kept until
+# close_map_figure() is called; callers outside the worker pool must call it
+_map_figure: MapFigure | None = None
+
+# Overlay shapefiles of the current worker process, set by _init_worker
+_worker_shapefiles: VisualLayers | None = None
 
 
 def create_map_visualization(
@@ -42,23 +75,87 @@ def create_map_visualization(
                                 final_path: Path,
                                 colors: list[tuple],
                                 boundaries: list[float],
-                                countries_shapefile: gpd.GeoDataFrame,
-                                central_countries_shapefile: gpd.GeoDataFrame,
-                                sea_shapefile: gpd.GeoDataFrame,
+                                shapefiles: VisualLayers,
+                                class_boundaries: list[float] | None = None,
+                                dpi: int = DPI,
+                                num_threads: int | None = None,
                                 ) -> None:
-    """Render a raster as a PNG map with country and sea layers on top."""
+    """
+    Render a raster as a map image with country and sea layers on top.
+    If class boundaries are given, the values are reclassified in memory
+    before they are coloured. The raster is decoded with num_threads threads.
+
+    The figure is cached per process and reused for the next map. Pool
+    workers free it when they exit; any other caller must call
+    close_map_figure() when done, or the 21x21 in figure stays alive for the
+    rest of the process.
+    """
     raster_data, transform, nodata_value, width, height = (
-        read_raster_for_visualization(raster_file)
+        read_raster_for_visualization(raster_file, num_threads)
     )
 
-    # Create a mask for NoData values and -999 values
+    if class_boundaries is not None:
+        raster_data = classify_values(
+            raster_data, class_boundaries, nodata_value
+            )
+
+    # Create a mask for NoData values and -999 values; NoData is usually -999
+    # as well, so the second pass is only made when it differs
     mask = (raster_data == -999)
-    if nodata_value is not None:
-        mask = np.logical_or(mask, raster_data == nodata_value)
+    if nodata_value is not None and nodata_value != -999:
+        np.logical_or(mask, raster_data == nodata_value, out=mask)
+
+    # Apply the mask; the array is freshly read, so wrap it without a copy
+    masked_data = np.ma.MaskedArray(raster_data, mask=mask, copy=False)
+
+    cmap, norm = _build_cmap(tuple(colors), tuple(boundaries))
+
+    map_figure = _get_map_figure(shapefiles, masked_data, transform, cmap, norm)
+
+    # Set the extent of the plot based on the raster transform
+    map_figure.ax.set_xlim(transform[2], transform[2] + width * transform[0])
+    map_figure.ax.set_ylim(transform[5] + height * transform[4], transform[5])
+
+    # Swap only the raster, the overlays stay as they were drawn
+    map_figure.image.set_data(masked_data)
+    map_figure.image.set_extent(plotting_extent(masked_data, transform))
+    map_figure.image.set_cmap(cmap)
+    map_figure.image.set_norm(norm)
+
+    # Render into memory without compression; the image is written to disk
+    # only once, after the sides are trimmed
+    buffer = BytesIO()
+    map_figure.fig.savefig(
+                        buffer,
+                        format='png',
+                        dpi=dpi,
+                        bbox_inches='tight',
+                        pad_inches=-0.04,
+                        pil_kwargs={"compress_level": 0},
+                        )
+    buffer.seek(0)
+
+    with Image.open(buffer) as rendered:
+        map_image = crop_sides(rendered, left=15, bottom=15)
+
+    # Save the final visualization; the path keeps the raster's .tif name, so
+    # PIL writes an uncompressed TIFF, which is fast to write and re-read
+    save_image(map_image, Path(final_path))
+
+    # Keep a copy at layout size, so each layout does not resize the full map
+    layout_path = layout_map_path(Path(final_path))
+    ensure_dir(layout_path.parent)
+    save_image(map_image.resize(LAYOUT_MAP_SIZE), layout_path)
 
-    # Apply the mask
-    masked_data = np.ma.masked_where(mask, raster_data)
 
+@lru_cache(maxsize=64)
+def _build_cmap(
+        colors: tuple[tuple, ...],
+        boundaries: tuple[float, ...],
+        ) -> tuple[ListedColormap, BoundaryNorm]:
+    """
+    Build the colormap and norm of a palette, once per palette.
+    """
     # Normalize colors to 0-1 range for matplotlib
     normalized_colors = [
         tuple(c / 255.0 for c in color) for color in colors
@@ -66,55 +163,129 @@ def create_map_visualization(
 
     # For discrete classes, use the original approach
     cmap = ListedColormap(normalized_colors)
-    norm = BoundaryNorm(boundaries, cmap.N, extend='max')
+    norm = BoundaryNorm(list(boundaries), cmap.N, extend='max')
+
+    return cmap, norm
+
+
+def _get_map_figure(
+        shapefiles: VisualLayers,
+        masked_data: np.ma.MaskedArray,
+        transform: Affine,
+        cmap: ListedColormap,
+        norm: BoundaryNorm,
+        ) -> MapFigure:
+    """
+    Return the cached figure, building it if the overlay layers or the raster
+    extent changed.
+    """
+    global _map_figure
+
+    extent = plotting_extent(masked_data, transform)
+
+    if (
+        _map_figure is not None
+        and _map_figure.shapefiles is shapefiles
+        and _map_figure.extent == extent
+    ):
+        return _map_figure
+
+    close_map_figure()
 
     # Create a figure for the visualization
     fig, ax = plt.subplots(figsize=(21, 21), dpi=DPI)
 
-    try:
+    # Set the extent before drawing so the overlays don't autoscale the axes
+    height, width = masked_data.shape
+    ax.set_xlim(transform[2], transform[2] + width * transform[0])
+    ax.set_ylim(transform[5] + height * transform[4], transform[5])
+
+    # Show the raster data with the colormap and normalization
+    show(masked_data, ax=ax, cmap=cmap, norm=norm, transform=transform)
+    image = ax.images[-1]
+
+    # Overlay the shapefiles on the plot, keeping only the shapes near the
+    # raster so each save draws fewer paths
+    _clip_to_extent(shapefiles.sea, extent).plot(
+                    ax=ax,
+                    facecolor=(156/255, 156/255, 156/255),
+                    edgecolor='none',
+                    linewidth=3
+                    )
+    _clip_to_extent(shapefiles.countries, extent).plot(
+                            ax=ax,
+                            facecolor='none',
+                            edgecolor='black',
+                            linewidth=1.2
+                            )
+    _clip_to_extent(shapefiles.central, extent).plot(
+                            ax=ax,
+                            facecolor='none',
+                            edgecolor='black',
+                            linewidth=3.2
+                            )
 
-        # Set the extent of the plot based on the raster transform
-        ax.set_xlim(transform[2], transform[2] + width * transform[0])
-        ax.set_ylim(transform[5] + height * transform[4], transform[5])
+    ax.set_axis_off()
 
-        # Show the raster data with the colormap and normalization
-        show(masked_data, ax=ax, cmap=cmap, norm=norm, transform=transform)
+    _map_figure = MapFigure(shapefiles, extent, fig, ax, image)
+    return _map_figure
 
-        # Overlay the shapefiles on the plot
-        sea_shapefile.plot(
-                        ax=ax,
-                        facecolor=(156/255, 156/255, 156/255),
-                        edgecolor='none',
-                        linewidth=3
-                        )
-        countries_shapefile.plot(
-                                ax=ax,
-                                facecolor='none',
-                                edgecolor='black',
-                                linewidth=1.2
-                                )
-        central_countries_shapefile.plot(
-                                        ax=ax,
-                                        facecolor='none',
-                                        edgecolor='black',
-                                        linewidth=3.2
-                                        )
-
-        ax.set_axis_off()
-
-        # Save the final visualization as a PNG image
-        plt.savefig(
-                    final_path,
-                    format='png',
-                    dpi=DPI,
-                    bbox_inches='tight',
-                    pad_inches=-0.04
-                    )
 
-        trim_image_sides(Path(final_path), left=15, bottom=15)
+def _clip_to_extent(
+        layer: gpd.GeoDataFrame,
+        extent: tuple[float, float, float, float],
+        ) -> gpd.GeoDataFrame:
+    """
+    Select the shapes of a layer that intersect the plot extent, padded so
+    that thick borders just outside the extent are kept.
+    """
+    left, right, bottom, top = extent
+    pad_x = (right - left) * EXTENT_PAD
+    pad_y = (top - bottom) * EXTENT_PAD
+    area = box(left - pad_x, bottom - pad_y, right + pad_x, top + pad_y)
+
+    # Keep the original row order, it is the drawing order
+    rows = np.sort(layer.sindex.query(area, predicate="intersects"))
+    return layer.iloc[rows]
+
 
-    finally:
-        plt.close(fig)
+def close_map_figure() -> None:
+    """
+    Close the cached map figure of this process, if there is one. Call it
+    after rendering outside the worker pool to free the figure.
+    """
+    global _map_figure
+
+    if _map_figure is not None:
+        plt.close(_map_figure.fig)
+        _map_figure = None
+
+
+def _init_worker(shapefiles: VisualLayers) -> None:
+    """
+    Keep the overlay shapefiles in the worker process, so they are sent once
+    per worker instead of once per raster and the map figure can be reused.
+    """
+    global _worker_shapefiles
+    _worker_shapefiles = shapefiles
+
+
+def _process_with_worker_shapefiles(
+        raster_path: Path,
+        work_folder: Path,
+        palettes: dict,
+        num_threads: int | None = None,
+        ):
+    """
+    Run process_single_raster with the shapefiles set by _init_worker.
+    """
+    if _worker_shapefiles is None:
+        raise RuntimeError("Worker shapefiles are not initialized")
+
+    return process_single_raster(
+        raster_path, _worker_shapefiles, work_folder, palettes,
+        num_threads=num_threads,
+        )
 
 
 def generate_palette_images(
@@ -129,18 +300,21 @@ def generate_palette_images(
     logger.info(f"Start visualization for palette: {palette_cfg.name}")
     layout_index: dict[str, list[Path]] = {}
 
+    max_workers = default_max_workers()
+
+    # Split the cores between the workers for decoding the rasters
     worker_func = partial(
-        process_single_raster,
-        countries_shapefile=shapefiles.countries,
-        central_countries_shapefile=shapefiles.central,
-        sea_shapefile=shapefiles.sea,
+        _process_with_worker_shapefiles,
         work_folder=palette_cfg.temp_dir,
-        palettes=palette_cfg.palettes
+        palettes=palette_cfg.palettes,
+        num_threads=threads_per_worker(max_workers),
     )
 
-    max_workers = min(cpu_count() - 1 if cpu_count() > 1 else 1, 8)
-
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shapefiles,),
+            ) as executor:
         results = list(tqdm(
                             executor.map(worker_func, rasters),
                             total=len(rasters),
@@ -151,9 +325,7 @@ def generate_palette_images(
     for res in results:
         if res:
             bg_type, path = res
-            if bg_type not in layout_index:
-                layout_index[bg_type] = []
-            layout_index[bg_type].append(path)
+            layout_index.setdefault(bg_type, []).append(path)
 
     logger.info("Preparing single raster data for the website")
     rename_and_copy_images(
@@ -206,11 +378,10 @@ def generate_visualizations(
 
 def process_single_raster(
         raster_path: Path,
-        countries_shapefile: gpd.GeoDataFrame,
-        central_countries_shapefile: gpd.GeoDataFrame,
-        sea_shapefile: gpd.GeoDataFrame,
+        shapefiles: VisualLayers,
         work_folder: Path,
-        palettes: dict
+        palettes: dict,
+        num_threads: int | None = None,
         ):
     """
     Render one raster to PNG and return its background type and image path.
@@ -228,9 +399,6 @@ def process_single_raster(
     colors = palette.colors
     classes = palette.classes
 
-    if palette.reclassify:
-        raster_path = reclassify_raster(raster_path, work_folder, boundaries)
-
     img_path = Path(work_folder) / Path(raster_path).name
 
     # Create visualization with shapefiles as overlays
@@ -239,9 +407,11 @@ def process_single_raster(
                                 img_path,
                                 colors,
                                 classes,
-                                countries_shapefile,
-                                central_countries_shapefile,
-                                sea_shapefile,
+                                shapefiles,
+                                class_boundaries=(
+                                    boundaries if palette.reclassify else None
+                                    ),
+                                num_threads=num_threads,
                                 )
 
     background_type = background_type_from_raster(raster_name_parts)
@@ -1,6 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
+from clim4cast_imagegen.core.constants import LAYOUT_MAP_DIR
 from clim4cast_imagegen.core.exceptions import InvalidRasterDateError
 
 
@@ -17,6 +18,27 @@ def extract_date(path: Path) -> datetime:
         raise InvalidRasterDateError(path) from exc
 
 
+def date_label(path: Path) -> str:
+    """
+    Build the DD.MM.YYYY label from the ISO date at the end of a filename.
+    """
+    date_part = path.stem.rpartition("_")[2]
+
+    # Slicing is much cheaper than strptime/strftime for the usual
+    # YYYY-MM-DD form; anything else still goes through strptime
+    year, month, day = date_part[0:4], date_part[5:7], date_part[8:10]
+    if (
+        len(date_part) == 10
+        and date_part[4] == date_part[7] == "-"
+        and year.isdigit() and month.isdigit() and day.isdigit()
+    ):
+        # date() rejects impossible months and days, as strptime does
+        date(int(year), int(month), int(day))
+        return f"{day}.{month}.{year}"
+
+    return datetime.strptime(date_part, "%Y-%m-%d").strftime("%d.%m.%Y")
+
+
 def background_type_from_template(path: Path) -> str:
     """
     Extract and normalize the background type from a file path.
@@ -58,6 +80,17 @@ def normalize_dfm_single_part(part: str) -> str:
     return part
 
 
+def composite_name(background_type: str) -> str:
+    """
+    Build the composite file stem from a background type
+    (DFM100H -> DFM_100H, AWD_0-40 -> AWD_0-40cm).
+    """
+    name = normalize_dfm_single_part(background_type)
+    if name.startswith("AW"):
+        name += "cm"
+    return name
+
+
 def normalize_dfm_name_parts(parts: list[str]) -> list[str]:
     """
     Apply the DFM prefix fix to every part of a filename.
@@ -75,3 +108,10 @@ def build_new_filename(path: Path, index: int) -> str:
     result = "_".join(name_parts) + f"_{index}.png"
 
     return result
+
+
+def layout_map_path(map_path: Path) -> Path:
+    """
+    Return the path of the layout-size copy of a rendered map.
+    """
+    return map_path.parent / LAYOUT_MAP_DIR / map_path.name
@@ -0,0 +1,15 @@
+import pytest
+
+from clim4cast_imagegen.core import pipeline
+from clim4cast_imagegen.core.pipeline import threads_per_worker
+
+
+@pytest.mark.parametrize("cores, workers, expected", [
+    (16, 8, 2),
+    (8, 7, 1),
+    (2, 8, 1),
+])
+def test_threads_per_worker_splits_cores(monkeypatch, cores, workers, expected):
+    monkeypatch.setattr(pipeline, "cpu_count", lambda: cores)
+
+    assert threads_per_worker(workers) == expected
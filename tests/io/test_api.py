@@ -36,7 +36,7 @@ class FakeSession:
         self.outcomes = list(outcomes)
         self.calls = 0
 
-    def post(self, url, data=None):
+    def post(self, url, data=None, headers=None):
         outcomes = self.outcomes[self.calls]
         self.calls += 1
         return FakeResp(outcomes)
@@ -147,3 +147,20 @@ def test_results_async_silent_when_all_uploaded(monkeypatch):
     monkeypatch.setattr(api, "upload_files_to_api", fake_files)
 
     asyncio.run(upload_results(_fake_config(), logging.getLogger("test")))
+
+
+def test_only_png_files_are_uploaded(tmp_path, monkeypatch):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "map.png").write_bytes(b"x")
+    (tmp_path / "run.log").write_bytes(b"x")
+
+    async def fake_upload(*, file_path, **kwargs):
+        return True
+
+    monkeypatch.setattr(api, "upload_single_file", fake_upload)
+
+    report = asyncio.run(upload_files_to_api(
+        base_url="http://x", username="u", password="p",
+        root_folder=tmp_path, logger=logging.getLogger("test"),
+    ))
+    assert [p.name for p in report.uploaded] == ["map.png"]
@@ -1,41 +1,47 @@
 from PIL import Image
 
-from clim4cast_imagegen.io.image_io import trim_image_sides
+from clim4cast_imagegen.io.image_io import crop_sides, open_rgba
 
 
-def test_trim_reduces_size(tmp_path):
-    path = tmp_path / "img.png"
-    Image.new("RGB", (100, 80), "blue").save(path)
-
-    trim_image_sides(path, left=15, bottom=10)
-
-    with Image.open(path) as img:
-        assert img.size == (85, 70)
+def test_crop_sides_returns_cropped_copy():
+    img = Image.new("RGB", (100, 80), "blue")
 
+    result = crop_sides(img, left=15, bottom=10)
 
-def test_trim_with_defaults_keeps_size(tmp_path):
-    path = tmp_path / "img.png"
-    Image.new("RGB", (50, 40), "blue").save(path)
-
-    trim_image_sides(path)
+    assert result.size == (85, 70)
+    assert img.size == (100, 80)
 
-    with Image.open(path) as img:
-        assert img.size == (50, 40)
 
-
-def test_trim_removes_the_correct_side(tmp_path):
-    path = tmp_path / "img.png"
+def test_crop_sides_removes_the_correct_side():
     img = Image.new("RGB", (10, 10), "blue")
 
     for y in range(10):
         img.putpixel((0, y), (255, 0, 0))
-    img.save(path)
 
-    trim_image_sides(path, left=1)
+    result = crop_sides(img, left=1)
 
-    with Image.open(path) as result:
-        colors = {result.getpixel((x, y)) for x in range(result.width)
-                                          for y in range(result.height)}
+    colors = {result.getpixel((x, y)) for x in range(result.width)
+                                      for y in range(result.height)}
 
     assert (255, 0, 0) not in colors
     assert result.size == (9, 10)
+
+
+def test_open_rgba_converts_rgb(tmp_path):
+    path = tmp_path / "img.png"
+    Image.new("RGB", (4, 3), "blue").save(path)
+
+    result = open_rgba(path)
+
+    assert result.mode == "RGBA"
+    assert result.getpixel((0, 0)) == (0, 0, 255, 255)
+
+
+def test_open_rgba_keeps_rgba_pixels(tmp_path):
+    path = tmp_path / "img.png"
+    Image.new("RGBA", (4, 3), (10, 20, 30, 40)).save(path)
+
+    result = open_rgba(path)
+
+    assert result.mode == "RGBA"
+    assert result.getpixel((3, 2)) == (10, 20, 30, 40)
@@ -1,19 +1,29 @@
+import logging
+
 import numpy as np
 import rasterio
+from pyproj import CRS
 from rasterio.transform import from_origin
 
-from clim4cast_imagegen.io.raster_io import reclassify_raster
+from clim4cast_imagegen.io.raster_io import (
+    classify_values,
+    clip_and_reproject_raster,
+    load_mask_shapes,
+)
+
+DEFAULT_TRANSFORM = from_origin(0, 0, 10, 10)
 
 
-def _make_raster(path, data, nodata=-999.0):
+def _make_raster(path, data, nodata=-999.0, crs="EPSG:3857",
+                 transform=DEFAULT_TRANSFORM):
     profile = {
         "driver": "GTiff",
         "height": data.shape[0],
         "width": data.shape[1],
         "count": 1,
         "dtype": "float32",
-        "crs": "EPSG:3857",
-        "transform": from_origin(0, 0, 10, 10),
+        "crs": crs,
+        "transform": transform,
     }
     if nodata is not None:
         profile["nodata"] = nodata
@@ -22,53 +32,105 @@ def _make_raster(path, data, nodata=-999.0):
     return path
 
 
-def test_reclassify_maps_values_to_classes(tmp_path):
+def test_classify_values_maps_values_to_classes():
     data = np.array([[-5, 5, 15], [25, 35, 5]], dtype="float32")
-    src = _make_raster(tmp_path / "input.tif", data)
-    out_dir = tmp_path / "out"
-    out_dir.mkdir()
-
-    result = reclassify_raster(src, out_dir, [0, 10, 20, 30])
 
-    with rasterio.open(result) as r:
-        classes = r.read(1)
+    classes = classify_values(data, [0, 10, 20, 30])
 
     expected = np.array([[-1, 0, 1], [2, 3, 0]], dtype="int16")
     assert np.array_equal(classes, expected)
 
 
-def test_reclassify_writes_to_output_dir_with_same_name(tmp_path):
-    src = _make_raster(tmp_path / "AWD_0-40cm.tif",
-                       np.array([[1.0]], dtype="float32"))
-    out_dir = tmp_path / "out"
-    out_dir.mkdir()
+def test_classify_values_defaults_nodata_to_minus_999():
+    data = np.array([[-999.0, 5.0, 15.0]], dtype="float32")
+
+    classes = classify_values(data, [-1000, 10, 20])
+
+    assert classes.dtype == np.int16
+    assert np.array_equal(classes, np.array([[-999, 0, 1]], dtype="int16"))
+
+
+def test_classify_values_replaces_out_of_range_nodata():
+    nodata = np.finfo(np.float32).min
+    data = np.array([[nodata, 5.0, 15.0]], dtype="float32")
 
-    result = reclassify_raster(src, out_dir, [0, 10])
+    classes = classify_values(data, [-1000, 10, 20], float(nodata))
 
-    assert result.parent == out_dir
-    assert result.name == "AWD_0-40cm.tif"
-    assert result.exists()
+    assert np.array_equal(classes, np.array([[-999, 0, 1]], dtype="int16"))
 
 
-def test_reclassify_output_is_int16(tmp_path):
-    src = _make_raster(tmp_path / "input.tif",
-                       np.array([[5.0, 15.0]], dtype="float32"))
-    out_dir = tmp_path / "out"
-    out_dir.mkdir()
+def test_classify_values_handles_nan_nodata():
+    data = np.array([[np.nan, 5.0, 15.0]], dtype="float32")
 
-    result = reclassify_raster(src, out_dir, [0, 10, 20])
+    classes = classify_values(data, [-1000, 10, 20], float("nan"))
 
-    with rasterio.open(result) as r:
-        assert r.dtypes[0] == "int16"
+    assert np.array_equal(classes, np.array([[-999, 0, 1]], dtype="int16"))
 
 
-def test_reclassify_defaults_nodata_when_source_has_none(tmp_path):
-    src = _make_raster(tmp_path / "input.tif",
-                       np.array([[5.0]], dtype="float32"), nodata=None)
-    out_dir = tmp_path / "out"
-    out_dir.mkdir()
+def test_classify_values_shifts_only_valid_pixels():
+    data = np.array([[-999.0, -5.0], [10.0, 25.0]], dtype="float32")
+
+    classes = classify_values(data, [0, 10, 20], -999.0)
+
+    assert classes.dtype == np.int16
+    assert np.array_equal(classes, np.array([[-999, -1], [0, 2]], dtype="int16"))
+
+
+def test_classify_values_float32_matches_float64_boundaries():
+    data = np.array([-0.9, 6.0, 6.0000005], dtype="float32")
+    boundaries = [-float("inf"), -0.9, 6, 9]
+
+    classes = classify_values(data, boundaries)
+
+    expected = np.digitize(data.astype("float64"), boundaries, right=True) - 1
+    assert np.array_equal(classes, expected)
 
-    result = reclassify_raster(src, out_dir, [0, 10])
 
-    with rasterio.open(result) as r:
+def _box(left, bottom, right, top):
+    return {
+        "type": "Polygon",
+        "coordinates": [[(left, bottom), (left, top), (right, top),
+                         (right, bottom), (left, bottom)]],
+    }
+
+
+def test_clip_and_reproject_crops_to_mask(tmp_path):
+    data = np.arange(100, dtype="float32").reshape(10, 10)
+    src = _make_raster(tmp_path / "input.tif", data)
+    out = tmp_path / "out.tif"
+
+    clip_and_reproject_raster(
+        src, [_box(20, -50, 60, -20)], CRS.from_epsg(3857), out
+        )
+
+    with rasterio.open(out) as r:
+        assert r.shape == (3, 4)
+        assert np.array_equal(r.read(1), data[2:5, 2:6])
+
+
+def test_clip_and_reproject_converts_crs(tmp_path):
+    data = np.ones((20, 20), dtype="float32")
+    src = _make_raster(tmp_path / "input.tif", data, crs="EPSG:4326",
+                       transform=from_origin(10, 50, 0.5, 0.5))
+    out = tmp_path / "out.tif"
+
+    clip_and_reproject_raster(
+        src, [_box(10, 40, 20, 50)], CRS.from_epsg(3857), out
+        )
+
+    with rasterio.open(out) as r:
+        assert r.crs.to_epsg() == 3857
         assert r.nodata == -999.0
+        assert set(np.unique(r.read(1))) <= {1.0, -999.0}
+
+
+def test_load_mask_shapes_covers_raster_bounds(tmp_path):
+    data = np.array([[1.0, 0.0], [0.0, 2.0]], dtype="float32")
+    src = _make_raster(tmp_path / "extent.tif", data)
+
+    shapes = load_mask_shapes(src, logging.getLogger("test"))
+
+    assert len(shapes) == 1
+    assert shapes[0]["type"] == "Polygon"
+    xs, ys = zip(*shapes[0]["coordinates"][0], strict=True)
+    assert (min(xs), min(ys), max(xs), max(ys)) == (0.0, -20.0, 20.0, 0.0)
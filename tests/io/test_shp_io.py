@@ -0,0 +1,43 @@
+import logging
+
+import geopandas as gpd
+import pytest
+from pyproj import CRS
+from shapely.geometry import Point
+
+from clim4cast_imagegen.io.shp_io import load_shp
+
+
+def _make_shp(path):
+    gdf = gpd.GeoDataFrame(
+        {"name": ["a", "b"]},
+        geometry=[Point(10, 50), Point(15, 45)],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(path)
+    return path
+
+
+def test_load_shp_reprojects_to_target_crs(tmp_path):
+    path = _make_shp(tmp_path / "points.shp")
+
+    result = load_shp(path, logging.getLogger("test"), CRS.from_epsg(3857))
+
+    assert result.crs.equals(CRS.from_epsg(3857))
+    assert len(result) == 2
+
+
+def test_load_shp_copy_protects_cache(tmp_path):
+    path = _make_shp(tmp_path / "points.shp")
+    logger = logging.getLogger("test")
+
+    first = load_shp(path, logger)
+    first.drop(index=0, inplace=True)
+    second = load_shp(path, logger)
+
+    assert len(second) == 2
+
+
+def test_load_shp_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_shp(tmp_path / "missing.shp", logging.getLogger("test"))
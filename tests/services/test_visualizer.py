@@ -0,0 +1,117 @@
+import geopandas as gpd
+import numpy as np
+import rasterio
+from PIL import Image
+from rasterio.transform import from_origin
+from shapely.geometry import box
+
+from clim4cast_imagegen.core.constants import LAYOUT_MAP_SIZE
+from clim4cast_imagegen.io.shp_io import VisualLayers
+from clim4cast_imagegen.services import visualizer
+from clim4cast_imagegen.services.visualizer import (
+    close_map_figure,
+    create_map_visualization,
+)
+from clim4cast_imagegen.utils.pathname_utils import layout_map_path
+
+
+def _layer(bounds=(0, -100, 100, 0)):
+    return gpd.GeoDataFrame(geometry=[box(*bounds)], crs="EPSG:3857")
+
+
+def _write_raster(path, data):
+    with rasterio.open(
+        path, "w", driver="GTiff", height=data.shape[0], width=data.shape[1],
+        count=1, dtype="float32", crs="EPSG:3857",
+        transform=from_origin(0, 0, 10, 10), nodata=-999.0,
+    ) as dst:
+        dst.write(data, 1)
+    return path
+
+
+def _read_pixels(path):
+    with Image.open(path) as img:
+        return np.asarray(img)
+
+
+def test_create_map_visualization_writes_layout_copy(tmp_path):
+    raster = _write_raster(
+        tmp_path / "HI_2026-07-10.tif",
+        np.arange(100, dtype="float32").reshape(10, 10),
+        )
+
+    final_path = tmp_path / "maps" / "HI_2026-07-10.png"
+    final_path.parent.mkdir()
+    layers = VisualLayers(countries=_layer(), central=_layer(), sea=_layer())
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+    try:
+        create_map_visualization(
+            raster, final_path, colors, [0, 50, 100], layers, dpi=20,
+            )
+    finally:
+        close_map_figure()
+
+    assert final_path.exists()
+    with Image.open(layout_map_path(final_path)) as layout_map:
+        assert layout_map.size == LAYOUT_MAP_SIZE
+
+
+def test_cached_figure_renders_like_a_fresh_figure(tmp_path):
+    data = np.arange(100, dtype="float32").reshape(10, 10)
+    classified = np.flip(data).copy()
+    classified[0, :] = -999.0
+    maps = [
+        (
+            _write_raster(tmp_path / "HI_2026-07-10.tif", data),
+            [(255, 0, 0), (0, 255, 0), (0, 0, 255)],
+            [0, 50, 100],
+            None,
+        ),
+        (
+            _write_raster(tmp_path / "AWD_0-40cm_2026-07-10.tif", classified),
+            [(10, 10, 10), (90, 90, 90), (170, 170, 170), (250, 250, 250)],
+            [-1, 0, 1, 2],
+            [0, 30, 60],
+        ),
+    ]
+    # Keep the sea to a corner so the raster itself stays visible
+    layers = VisualLayers(
+        countries=_layer(), central=_layer(), sea=_layer((0, -20, 20, 0)),
+        )
+
+    def render(folder, raster, colors, boundaries, class_boundaries):
+        folder.mkdir(exist_ok=True)
+        final_path = folder / raster.with_suffix(".png").name
+        create_map_visualization(
+            raster, final_path, colors, boundaries, layers,
+            class_boundaries=class_boundaries, dpi=20,
+            )
+        return final_path
+
+    try:
+        # Both maps go through one cached figure
+        cached = []
+        for raster, colors, boundaries, class_boundaries in maps:
+            cached.append(render(
+                tmp_path / "cached", raster, colors, boundaries,
+                class_boundaries,
+                ))
+            if len(cached) == 1:
+                first_figure = visualizer._map_figure
+        assert visualizer._map_figure is first_figure
+
+        # Each map again on a newly built figure
+        fresh = []
+        for raster, colors, boundaries, class_boundaries in maps:
+            close_map_figure()
+            fresh.append(render(
+                tmp_path / "fresh", raster, colors, boundaries,
+                class_boundaries,
+                ))
+    finally:
+        close_map_figure()
+
+    assert not np.array_equal(_read_pixels(cached[0]), _read_pixels(cached[1]))
+    for cached_path, fresh_path in zip(cached, fresh, strict=True):
+        assert np.array_equal(_read_pixels(cached_path), _read_pixels(fresh_path))
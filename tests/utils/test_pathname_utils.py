@@ -8,7 +8,10 @@ from clim4cast_imagegen.utils.pathname_utils import (
     background_type_from_raster,
     background_type_from_template,
     build_new_filename,
+    composite_name,
+    date_label,
     extract_date,
+    layout_map_path,
     normalize_dfm_name_parts,
     normalize_dfm_single_part,
 )
@@ -76,6 +79,14 @@ NORMALIZE_DFM_NAME_PARTS_EXAMPLES = [
         (['UTCI'], ['UTCI']),
     ]
 
+COMPOSITE_NAME_EXAMPLES = [
+    ("AWD_0-100", "AWD_0-100cm"),
+    ("AWP_0-40", "AWP_0-40cm"),
+    ("DFM1000H", "DFM_1000H"),
+    ("FWI_GenZ", "FWI_GenZ"),
+    ("HI", "HI"),
+]
+
 BUILD_NEW_FILENAME_EXAMPLES = [
     (Path("AWD_0-100cm_2026-06-26.tif"), 3, "AWD_0-100cm_3.png"),
     (Path("AWP_0-40cm_2026-07-04.tif"), 8, "AWP_0-40cm_8.png"),
@@ -137,8 +148,38 @@ def test_normalize_dfm_name_parts(parts, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize("background_type, expected", COMPOSITE_NAME_EXAMPLES)
+def test_composite_name(background_type, expected):
+    assert composite_name(background_type) == expected
+
+
 @pytest.mark.parametrize("path, index, expected", BUILD_NEW_FILENAME_EXAMPLES)
 def test_build_new_filename(path, index, expected):
     result = build_new_filename(path, index)
 
     assert result == expected
+
+
+def test_layout_map_path_keeps_name_in_layout_subfolder():
+    result = layout_map_path(Path("temp/img_v1/HI_2026-07-10.tif"))
+
+    assert result == Path("temp/img_v1/layout/HI_2026-07-10.tif")
+
+
+@pytest.mark.parametrize("path, expected", [
+    (Path("AWD_0-40cm_2026-07-06.tif"), "06.07.2026"),
+    (Path("layout/HI_2026-12-31.tif"), "31.12.2026"),
+])
+def test_date_label(path, expected):
+    assert date_label(path) == expected
+
+
+@pytest.mark.parametrize("path", [
+    Path("HI_20260706.tif"),
+    Path("HI_abcd-ef-gh.tif"),
+    Path("HI_2026-13-45.tif"),
+    Path("HI_2026-02-30.tif"),
+])
+def test_date_label_invalid_date_raises(path):
+    with pytest.raises(ValueError):
+        date_label(path)